@@ -1,54 +1,74 @@
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
-import json
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel, Field
+import hashlib
+import orjson
 import re
+import sys
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Optional, Dict, List
 
 app = FastAPI(title="Unix to PowerShell Command Converter", version="1.0.0")
 
+# Fallback mappings if command_mappings.json doesn't exist
+def _fallback():
+    return {
+        "ls": "Get-ChildItem",
+        "pwd": "Get-Location",
+        "cd": "Set-Location",
+        "mkdir": "New-Item -ItemType Directory",
+        "rmdir": "Remove-Item -Recurse",
+        "rm": "Remove-Item",
+        "cp": "Copy-Item",
+        "mv": "Move-Item",
+        "cat": "Get-Content",
+        "grep": "Select-String",
+        "find": "Get-ChildItem -Recurse",
+        "ps": "Get-Process",
+        "kill": "Stop-Process",
+        "chmod": "Set-ItemProperty",
+        "which": "Get-Command",
+        "echo": "Write-Output",
+        "env": "Get-ChildItem Env:",
+        "history": "Get-History",
+        "clear": "Clear-Host",
+        "head": "Get-Content | Select-Object -First",
+        "tail": "Get-Content | Select-Object -Last",
+        "wc": "Measure-Object",
+        "sort": "Sort-Object",
+        "uniq": "Get-Unique",
+        "df": "Get-WmiObject -Class Win32_LogicalDisk",
+        "du": "Get-ChildItem | Measure-Object -Property Length -Sum",
+        "mount": "Get-WmiObject -Class Win32_Volume",
+        "wget": "Invoke-WebRequest",
+        "curl": "Invoke-RestMethod",
+        "tar": "Expand-Archive / Compress-Archive",
+        "ssh": "Enter-PSSession",
+        "scp": "Copy-Item -ToSession / Copy-Item -FromSession"
+    }
+
 # Load command mappings from JSON file
 def load_command_mappings():
     try:
-        with open("command_mappings.json", "r") as f:
-            return json.load(f)
+        with open("command_mappings.json", "rb") as f:
+            mappings = orjson.loads(f.read())
     except FileNotFoundError:
-        # Fallback mappings if file doesn't exist
-        return {
-            "ls": "Get-ChildItem",
-            "pwd": "Get-Location",
-            "cd": "Set-Location",
-            "mkdir": "New-Item -ItemType Directory",
-            "rmdir": "Remove-Item -Recurse",
-            "rm": "Remove-Item",
-            "cp": "Copy-Item",
-            "mv": "Move-Item",
-            "cat": "Get-Content",
-            "grep": "Select-String",
-            "find": "Get-ChildItem -Recurse",
-            "ps": "Get-Process",
-            "kill": "Stop-Process",
-            "chmod": "Set-ItemProperty",
-            "which": "Get-Command",
-            "echo": "Write-Output",
-            "env": "Get-ChildItem Env:",
-            "history": "Get-History",
-            "clear": "Clear-Host",
-            "head": "Get-Content | Select-Object -First",
-            "tail": "Get-Content | Select-Object -Last",
-            "wc": "Measure-Object",
-            "sort": "Sort-Object",
-            "uniq": "Get-Unique",
-            "df": "Get-WmiObject -Class Win32_LogicalDisk",
-            "du": "Get-ChildItem | Measure-Object -Property Length -Sum",
-            "mount": "Get-WmiObject -Class Win32_Volume",
-            "wget": "Invoke-WebRequest",
-            "curl": "Invoke-RestMethod",
-            "tar": "Expand-Archive / Compress-Archive",
-            "ssh": "Enter-PSSession",
-            "scp": "Copy-Item -ToSession / Copy-Item -FromSession"
-        }
+        mappings = _fallback()
+    # Interned keys share storage with the matching literals in the handler tables
+    mappings = {sys.intern(k): v for k, v in mappings.items()}
+    # Mappings are read-only after load so converted results can be cached safely
+    return MappingProxyType(mappings)
 
 command_mappings = load_command_mappings()
+# Bound once so hot paths do a single hash lookup per command
+_LOOKUP = command_mappings.get
+
+# /mappings body and its ETag are constant, so build them once at startup
+_MAPPINGS_BYTES = orjson.dumps({"mappings": dict(command_mappings), "total_commands": len(command_mappings)})
+_ETAG = '"' + hashlib.md5(_MAPPINGS_BYTES).hexdigest() + '"'
+
+# Shared 404 for unknown commands, returned without raising HTTPException
+_NOT_FOUND = Response(content=b'{"detail":"No mapping found for command"}', status_code=404, media_type="application/json")
 
 class UnixCommand(BaseModel):
     command: str
@@ -60,111 +80,235 @@ class PowerShellResponse(BaseModel):
     explanation: Optional[str] = None
     status: str
 
+# Upper bound on commands per /convert_batch request
+MAX_BATCH_ITEMS = 100
+
+class BatchRequest(BaseModel):
+    items: List[UnixCommand] = Field(max_length=MAX_BATCH_ITEMS)
+
 class CommandMappingsResponse(BaseModel):
     mappings: Dict[str, str]
     total_commands: int
 
-def convert_unix_to_powershell(unix_cmd: str) -> tuple[str, str]:
+# Tokenizer for commands: double-quoted, single-quoted or bare arguments.
+# Tokens keep their quotes so arguments joined back into a command line
+# stay intact; handlers that add their own quotes unquote them first.
+_TOKEN_RE = re.compile(r'"([^"]*)"|\'([^\']*)\'|(\S+)')
+
+def _tokenize(cmd: str) -> tuple[str, ...]:
     """
-    Convert Unix command to PowerShell equivalent
-    Returns tuple of (powershell_command, explanation)
+    Split an already stripped command into a tuple of raw tokens, quotes kept
     """
-    unix_cmd = unix_cmd.strip()
+    return tuple(m.group(0) for m in _TOKEN_RE.finditer(cmd))
+
+def _unquote(token: str) -> str:
+    """
+    Strip the surrounding quotes from a raw token, if it has them
+    """
+    if len(token) >= 2 and token[0] == token[-1] and token[0] in "\"'":
+        return token[1:-1]
+    return token
+
+# Flag checks inside the handlers stay plain str.startswith / set lookups;
+# regex is reserved for tokenizing and the dispatch scan below.
+
+# Flags that select the detailed listing for ls
+LS_LONG_FLAGS = frozenset(["-la", "-l"])
+LS_ALL_FLAGS = frozenset(["-a"])
+
+# Output templates for fixed-shape PowerShell commands
+_GREP_2_TMPL = "Select-String -Pattern '{p}' -Path '{f}'"
+_GREP_1_TMPL = "Select-String -Pattern '{p}'"
+_HEAD_TMPL = "Get-Content '{f}' | Select-Object -First {n}"
+_TAIL_TMPL = "Get-Content '{f}' | Select-Object -Last {n}"
+_KILL_TMPL = "Stop-Process -Id {pid}"
+
+# Commands that take a single target path as their argument
+TARGET_COMMANDS = frozenset(["cd", "mkdir", "rmdir", "rm", "cp", "mv", "cat"])
+
+def _ls(args, ps_base):
+    arg_set = set(_unquote(a) for a in args)
+    if arg_set & LS_LONG_FLAGS:
+        return "Get-ChildItem | Format-List", "Lists files with detailed information"
+    elif arg_set & LS_ALL_FLAGS:
+        return "Get-ChildItem -Force", "Lists all files including hidden ones"
+    else:
+        return ps_base, "Lists files and directories"
+
+def _grep(args, ps_base):
+    if len(args) >= 1:
+        pattern = _unquote(args[0])
+        if len(args) >= 2:
+            file = _unquote(args[1])
+            return _GREP_2_TMPL.format(p=pattern, f=file), f"Searches for pattern '{pattern}' in file '{file}'"
+        else:
+            return _GREP_1_TMPL.format(p=pattern), f"Searches for pattern '{pattern}' in input"
+    else:
+        return ps_base, "Searches for patterns in text"
+
+def _find(args, ps_base):
+    if len(args) >= 1:
+        # Single pass gives both presence and position of -name
+        name_idx = next((i for i, a in enumerate(args) if a == "-name"), -1)
+        if name_idx >= 0:
+            if name_idx + 1 < len(args):
+                pattern = _unquote(args[name_idx + 1])
+                return f"Get-ChildItem -Recurse -Name '*{pattern}*'", f"Finds files matching pattern '{pattern}'"
+        else:
+            path = _unquote(args[0])
+            return f"Get-ChildItem -Path '{path}' -Recurse", f"Lists all files in directory '{path}' recursively"
+    return ps_base, "Finds files and directories"
+
+def _head(args, ps_base):
+    if len(args) >= 1 and _unquote(args[0]).startswith("-"):
+        lines = _unquote(args[0])[1:]  # Remove the dash
+        if len(args) >= 2:
+            file = _unquote(args[1])
+            return _HEAD_TMPL.format(f=file, n=lines), f"Shows first {lines} lines of file '{file}'"
+        else:
+            return f"Select-Object -First {lines}", f"Shows first {lines} lines"
+    else:
+        return "Get-Content | Select-Object -First 10", "Shows first 10 lines (default)"
+
+def _tail(args, ps_base):
+    if len(args) >= 1 and _unquote(args[0]).startswith("-"):
+        lines = _unquote(args[0])[1:]  # Remove the dash
+        if len(args) >= 2:
+            file = _unquote(args[1])
+            return _TAIL_TMPL.format(f=file, n=lines), f"Shows last {lines} lines of file '{file}'"
+        else:
+            return f"Select-Object -Last {lines}", f"Shows last {lines} lines"
+    else:
+        return "Get-Content | Select-Object -Last 10", "Shows last 10 lines (default)"
+
+def _kill(args, ps_base):
+    if len(args) >= 1:
+        pid = args[0]
+        return _KILL_TMPL.format(pid=pid), f"Terminates process with ID {pid}"
+    else:
+        return ps_base, "Terminates processes"
+
+# Explanation suffix for default-case commands called with arguments
+_WITH_ARGUMENTS = " with arguments"
+
+def _target(base_command):
+    # Built once per command when the dispatch table is created
+    explanation = f"PowerShell equivalent of {base_command}"
+    def handler(args, ps_base):
+        if len(args) >= 1:
+            # A single target is wrapped in our own quotes; several keep their raw text
+            target = _unquote(args[0]) if len(args) == 1 else " ".join(args)
+            return f"{ps_base} '{target}'", f"Performs {base_command} operation on '{target}'"
+        else:
+            return ps_base, explanation
+    return handler
+
+def _default(base_command):
+    # Built once per command when the dispatch table is created
+    explanation = f"PowerShell equivalent of {base_command}"
+    explanation_with_args = explanation + _WITH_ARGUMENTS
+    def handler(args, ps_base):
+        # Default case - return base mapping with args
+        if args:
+            return f"{ps_base} {' '.join(args)}", explanation_with_args
+        else:
+            return ps_base, explanation
+    return handler
+
+# Dispatch table built once at import: base command -> handler(args, ps_base)
+HANDLERS = {
+    "ls": _ls,
+    "grep": _grep,
+    "find": _find,
+    "head": _head,
+    "tail": _tail,
+    "kill": _kill,
+}
+HANDLERS.update({cmd: _target(cmd) for cmd in TARGET_COMMANDS})
+HANDLERS.update({cmd: _default(cmd) for cmd in command_mappings if cmd not in HANDLERS})
+
+# Common fixed-shape commands, matched in one scan by a single precompiled
+# alternation. Each route is (pattern, base command, fixed leading args,
+# argument group names); captured groups are appended to the fixed args.
+# Arguments exclude quotes so quoted commands fall through to the tokenizer.
+_ARG = r"""[^\s'"]+"""
+_ROUTES = {
+    "ls": (r"ls\s+(?P<ls_flag>-la?|-a)", "ls", (), ("ls_flag",)),
+    "head": (rf"head\s+(?P<head_n>-[^\s'\"]*)(?:\s+(?P<head_f>{_ARG})(?:\s+{_ARG})*)?", "head", (), ("head_n", "head_f")),
+    "tail": (rf"tail\s+(?P<tail_n>-[^\s'\"]*)(?:\s+(?P<tail_f>{_ARG})(?:\s+{_ARG})*)?", "tail", (), ("tail_n", "tail_f")),
+    "grep2": (rf"grep\s+(?P<grep_p>{_ARG})\s+(?P<grep_f>{_ARG})(?:\s+{_ARG})*", "grep", (), ("grep_p", "grep_f")),
+    # The path before -name is irrelevant to the handler, so pass just -name <pattern>
+    "find_name": (rf"find\s+(?:{_ARG}\s+)*?-name\s+(?P<find_p>{_ARG})(?:\s+{_ARG})*", "find", ("-name",), ("find_p",)),
+    "kill": (rf"kill\s+(?P<kill_pid>{_ARG})(?:\s+{_ARG})*", "kill", (), ("kill_pid",)),
+}
+# Only route commands that are actually mapped, so a custom mappings file
+# without e.g. "ls" still reports it as unmapped
+_DISPATCH = re.compile("|".join(
+    f"(?P<{name}>{pattern})" for name, (pattern, base, _, _) in _ROUTES.items() if base in command_mappings
+) or "(?!)")
+
+def _dispatch_fast(unix_cmd):
+    """
+    Convert via the single-scan dispatch regex, or return None if no route matched
+    """
+    m = _DISPATCH.fullmatch(unix_cmd)
+    if m is None:
+        return None
+    _, base_command, prefix, names = _ROUTES[m.lastgroup]
+    args = prefix + tuple(m[n] for n in names if m[n] is not None)
+    return HANDLERS[base_command](args, command_mappings[base_command])
+
+# Longest command (after stripping) whose conversion is memoized
+_MAX_CACHED_LEN = 256
+
+@lru_cache(maxsize=4096)
+def _convert_cached(unix_cmd: str) -> tuple[str, str]:
+    """
+    Convert an already stripped Unix command, memoized per command string
+    """
+    result = _dispatch_fast(unix_cmd)
+    if result is not None:
+        return result
     
     # Handle command with arguments
-    parts = unix_cmd.split()
-    base_command = parts[0] if parts else ""
-    args = parts[1:] if len(parts) > 1 else []
+    parts = _tokenize(unix_cmd)
+    base_command = _unquote(parts[0]) if parts else ""
+    args = parts[1:]
     
     # Direct mapping for base commands
-    if base_command in command_mappings:
-        ps_base = command_mappings[base_command]
-        
-        # Handle specific command patterns with arguments
-        if base_command == "ls":
-            if "-la" in args or "-l" in args:
-                return "Get-ChildItem | Format-List", "Lists files with detailed information"
-            elif "-a" in args:
-                return "Get-ChildItem -Force", "Lists all files including hidden ones"
-            else:
-                return ps_base, "Lists files and directories"
-        
-        elif base_command == "grep":
-            if len(args) >= 1:
-                pattern = args[0]
-                if len(args) >= 2:
-                    file = args[1]
-                    return f"Select-String -Pattern '{pattern}' -Path '{file}'", f"Searches for pattern '{pattern}' in file '{file}'"
-                else:
-                    return f"Select-String -Pattern '{pattern}'", f"Searches for pattern '{pattern}' in input"
-            else:
-                return ps_base, "Searches for patterns in text"
-        
-        elif base_command == "find":
-            if len(args) >= 1:
-                if "-name" in args:
-                    name_idx = args.index("-name")
-                    if name_idx + 1 < len(args):
-                        pattern = args[name_idx + 1]
-                        return f"Get-ChildItem -Recurse -Name '*{pattern}*'", f"Finds files matching pattern '{pattern}'"
-                else:
-                    path = args[0]
-                    return f"Get-ChildItem -Path '{path}' -Recurse", f"Lists all files in directory '{path}' recursively"
-            else:
-                return ps_base, "Finds files and directories"
-        
-        elif base_command == "head":
-            if len(args) >= 1 and args[0].startswith("-"):
-                lines = args[0][1:]  # Remove the dash
-                if len(args) >= 2:
-                    file = args[1]
-                    return f"Get-Content '{file}' | Select-Object -First {lines}", f"Shows first {lines} lines of file '{file}'"
-                else:
-                    return f"Select-Object -First {lines}", f"Shows first {lines} lines"
-            else:
-                return "Get-Content | Select-Object -First 10", "Shows first 10 lines (default)"
-        
-        elif base_command == "tail":
-            if len(args) >= 1 and args[0].startswith("-"):
-                lines = args[0][1:]  # Remove the dash
-                if len(args) >= 2:
-                    file = args[1]
-                    return f"Get-Content '{file}' | Select-Object -Last {lines}", f"Shows last {lines} lines of file '{file}'"
-                else:
-                    return f"Select-Object -Last {lines}", f"Shows last {lines} lines"
-            else:
-                return "Get-Content | Select-Object -Last 10", "Shows last 10 lines (default)"
-        
-        elif base_command == "kill":
-            if len(args) >= 1:
-                pid = args[0]
-                return f"Stop-Process -Id {pid}", f"Terminates process with ID {pid}"
-            else:
-                return ps_base, "Terminates processes"
-        
-        elif base_command in ["cd", "mkdir", "rmdir", "rm", "cp", "mv", "cat"]:
-            if len(args) >= 1:
-                target = " ".join(args)
-                return f"{ps_base} '{target}'", f"Performs {base_command} operation on '{target}'"
-            else:
-                return ps_base, f"PowerShell equivalent of {base_command}"
-        
-        else:
-            # Default case - return base mapping with args
-            if args:
-                return f"{ps_base} {' '.join(args)}", f"PowerShell equivalent of {base_command} with arguments"
-            else:
-                return ps_base, f"PowerShell equivalent of {base_command}"
-    
-    else:
+    ps_base = _LOOKUP(base_command)
+    if ps_base is None:
         return f"# No direct mapping found for '{base_command}'", f"Command '{base_command}' doesn't have a direct PowerShell equivalent in our database"
+    return HANDLERS[base_command](args, ps_base)
+
+def convert_unix_to_powershell(unix_cmd: str) -> tuple[str, str]:
+    """
+    Convert Unix command to PowerShell equivalent
+    Returns tuple of (powershell_command, explanation)
+    """
+    unix_cmd = unix_cmd.strip()
+    # Long commands skip the cache so clients can't pin large strings in it
+    if len(unix_cmd) > _MAX_CACHED_LEN:
+        return _convert_cached.__wrapped__(unix_cmd)
+    return _convert_cached(unix_cmd)
+
+def _powershell_response(item: UnixCommand) -> dict:
+    ps_command, explanation = convert_unix_to_powershell(item.command)
+    return {
+        "unix_command": item.command,
+        "powershell_command": ps_command,
+        "explanation": explanation if item.include_explanation else None,
+        "status": "success"
+    }
 
 @app.get("/")
 def read_root():
-    return {"message": "Unix to PowerShell Command Converter API", "endpoints": ["/convert", "/mappings", "/docs"]}
+    return {"message": "Unix to PowerShell Command Converter API", "endpoints": ["/convert", "/convert_batch", "/mappings", "/docs"]}
 
+# response_model lets FastAPI validate and serialize straight to JSON bytes
+# via Pydantic, which is faster than jsonable_encoder
 @app.post("/convert", response_model=PowerShellResponse)
-def convert_command(request: UnixCommand):
+def convert_command(request: UnixCommand) -> dict:
     """
     Convert a Unix command to its PowerShell equivalent
     """
@@ -172,47 +316,80 @@ def convert_command(request: UnixCommand):
         raise HTTPException(status_code=400, detail="Command cannot be empty")
     
     try:
-        ps_command, explanation = convert_unix_to_powershell(request.command)
-        
-        response = PowerShellResponse(
-            unix_command=request.command,
-            powershell_command=ps_command,
-            status="success"
-        )
-        
-        if request.include_explanation:
-            response.explanation = explanation
-        
-        return response
+        return _powershell_response(request)
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error converting command: {str(e)}")
+
+@app.post("/convert_batch", response_model=List[PowerShellResponse])
+def convert_batch(request: BatchRequest) -> list:
+    """
+    Convert several Unix commands in one request, in the order given
+    """
+    for i, item in enumerate(request.items):
+        if not item.command.strip():
+            raise HTTPException(status_code=400, detail=f"Command at index {i} cannot be empty")
+    
+    try:
+        return [_powershell_response(item) for item in request.items]
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error converting command: {str(e)}")
 
-@app.get("/mappings", response_model=CommandMappingsResponse)
-def get_command_mappings():
+def _etag_matches(if_none_match):
+    """
+    Weak comparison of an If-None-Match header against _ETAG (RFC 9110)
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == _ETAG:
+            return True
+    return False
+
+# No response_model: the body is prebuilt, the model only documents its shape
+@app.get("/mappings", responses={200: {"model": CommandMappingsResponse}})
+def get_command_mappings(request: Request):
     """
     Get all available Unix to PowerShell command mappings
     """
-    return CommandMappingsResponse(
-        mappings=command_mappings,
-        total_commands=len(command_mappings)
-    )
+    if _etag_matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers={"ETag": _ETAG})
+    return Response(content=_MAPPINGS_BYTES, media_type="application/json", headers={"ETag": _ETAG})
 
 @app.get("/mappings/{unix_command}")
 def get_specific_mapping(unix_command: str):
     """
     Get PowerShell equivalent for a specific Unix command
     """
-    if unix_command in command_mappings:
-        return {
-            "unix_command": unix_command,
-            "powershell_command": command_mappings[unix_command],
-            "status": "found"
-        }
-    else:
-        raise HTTPException(status_code=404, detail=f"No mapping found for command: {unix_command}")
+    ps_command = _LOOKUP(unix_command)
+    if ps_command is None:
+        return _NOT_FOUND
+    return {
+        "unix_command": unix_command,
+        "powershell_command": ps_command,
+        "status": "found"
+    }
+
+@app.get("/cache_info")
+def get_cache_info():
+    """
+    Get hit/miss statistics for the conversion cache
+    Each worker process has its own cache, so this reports only the worker
+    that served the request
+    """
+    return _convert_cached.cache_info()._asdict()
 
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # Workers need an import string; uvicorn uses uvloop and httptools by
+    # default when they are installed
+    uvicorn.run(
+        "FastAPI_UnixToPS_main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=os.cpu_count(),
+    )
     
\ No newline at end of file